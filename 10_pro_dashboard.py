@@ -1,15 +1,15 @@
 import pandas as pd
-import json
 import joblib
 import numpy as np
+from tree_bands import proba_bands, discounted_kelly
+from state_snapshot import load_state
 
 # 1. Load the Infrastructure
 model_res = joblib.load('model_result.pkl')
 model_goals = joblib.load('model_goals.pkl')
 model_corners = joblib.load('model_corners.pkl')
 
-with open('current_elo.json', 'r') as f:
-    elo_ratings = json.load(f)
+elo_ratings = load_state().elo
 
 # Load training data to get the LATEST rolling stats for each team
 df_stats = pd.read_csv('pro_training_data.csv')
@@ -45,45 +45,50 @@ def run_dashboard():
         # Build Feature Vector for AI
         features = np.array([[h_elo, a_elo, h_goals, a_goals, h_corners, a_corners, h_eff, a_eff]])
 
-        # 2. RUN ALL BRAINS
-        prob_res = model_res.predict_proba(features)[0]   # [Away, Draw, Home]
-        prob_goals = model_goals.predict_proba(features)[0] # [Under 2.5, Over 2.5]
-        prob_corn = model_corners.predict_proba(features)[0] # [Under 9.5, Over 9.5]
+        # 2. RUN ALL BRAINS (every tree's vote, not just the average)
+        band_res = proba_bands(model_res, features)
+        band_goals = proba_bands(model_goals, features)
+        band_corn = proba_bands(model_corners, features)
+        prob_res = band_res['mean'][0]   # [Away, Draw, Home]
+        prob_goals = band_goals['mean'][0] # [Under 2.5, Over 2.5]
+        prob_corn = band_corn['mean'][0] # [Under 9.5, Over 9.5]
+
+        def spread(band, col):
+            return f"({band['p10'][0][col]:.0%}-{band['p90'][0][col]:.0%})"
 
         print(f"\n--- MATCH DYNAMICS: {home} vs {away} ---")
-        print(f"📈 Match Outcome:  {home} Win: {prob_res[2]:.1%} | Draw: {prob_res[1]:.1%} | {away} Win: {prob_res[0]:.1%}")
-        print(f"🥅 Goal Outlook:   Over 2.5 Goals: {prob_goals[1]:.1%}")
-        print(f"🚩 Corner Outlook: Over 9.5 Corners: {prob_corn[1]:.1%}")
+        print(f"📈 Match Outcome:  {home} Win: {prob_res[2]:.1%} {spread(band_res, 2)} | Draw: {prob_res[1]:.1%} {spread(band_res, 1)} | {away} Win: {prob_res[0]:.1%} {spread(band_res, 0)}")
+        print(f"🥅 Goal Outlook:   Over 2.5 Goals: {prob_goals[1]:.1%} {spread(band_goals, 1)}")
+        print(f"🚩 Corner Outlook: Over 9.5 Corners: {prob_corn[1]:.1%} {spread(band_corn, 1)}")
+        print("   (brackets = 10th-90th percentile across the forest's trees)")
 
         # 3. DYNAMICAL RECOMMENDATION ENGINE
         print("\n--- 🤖 AI STRATEGY ADVICE ---")
         
         # We look for the "Path of Least Resistance" (Highest Probability)
         options = [
-            ("Home Win", prob_res[2], "W1"),
-            ("Away Win", prob_res[0], "W2"),
-            ("Over 2.5 Goals", prob_goals[1], "O2.5"),
-            ("Over 9.5 Corners", prob_corn[1], "C9.5")
+            ("Home Win", prob_res[2], "W1", band_res['std'][0][2]),
+            ("Away Win", prob_res[0], "W2", band_res['std'][0][0]),
+            ("Over 2.5 Goals", prob_goals[1], "O2.5", band_goals['std'][0][1]),
+            ("Over 9.5 Corners", prob_corn[1], "C9.5", band_corn['std'][0][1])
         ]
         
         # Sort by highest probability
         options.sort(key=lambda x: x[1], reverse=True)
-        best_name, best_prob, bet_label = options[0]
+        best_name, best_prob, bet_label, best_std = options[0]
 
         print(f"STRATEGY: The most likely outcome is '{best_name}' ({best_prob:.1%})")
         
         bookie_odds = float(input(f"Enter 1xBet Odds for {bet_label}: "))
         
         # Kelly Criterion for the Best Option
-        b = bookie_odds - 1
         edge = (best_prob * bookie_odds) - 1
         
         if edge > 0.02:
-            # Use 1/8 Kelly for professional safety
-            kelly = ((b * best_prob) - (1 - best_prob)) / b
-            bet_amount = (kelly / 8) * balance
+            # Use 1/8 Kelly for professional safety, shrunk when the trees disagree
+            bet_amount = discounted_kelly(best_prob, best_std, bookie_odds) * balance
             print(f"\n✅ ACTION: Bet ${max(0.20, bet_amount):.2f} on {best_name}")
-            print(f"📊 Projected Edge: {edge:.1%}")
+            print(f"📊 Projected Edge: {edge:.1%} (tree spread ±{best_std:.1%})")
         else:
             print("\n❌ NO VALUE: Even though this is likely, the odds are too low.")
 
@@ -1,5 +1,5 @@
 import pandas as pd
-import json
+from state_snapshot import update_state
 
 def create_master_snapshot():
     df = pd.read_csv('master_training_data.csv')
@@ -23,8 +23,8 @@ def create_master_snapshot():
             }
         latest_stats[team] = stats
 
-    with open('team_stats_snapshot.json', 'w') as f:
-        json.dump(latest_stats, f)
+    # Runtime snapshot + team_stats_snapshot.json export
+    update_state(stats=latest_stats)
     print("✅ Master Snapshot Saved.")
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 import requests
-import json
+from state_snapshot import update_state
 
 # --- CONFIG ---
 # Paste the key from dashboard.api-football.com here
@@ -41,8 +41,8 @@ def fetch_live_fixtures():
         }
         upcoming.append(match_info)
 
-    with open('upcoming_matches.json', 'w') as f:
-        json.dump(upcoming, f)
+    # Runtime snapshot + upcoming_matches.json export
+    update_state(fixtures=upcoming)
     
     print(f"✅ Success! Found {len(upcoming)} upcoming League One matches.")
 
@@ -0,0 +1,281 @@
+import json
+import time
+import random
+import socket
+import argparse
+import numpy as np
+from match_features import load_assets, build_matrix
+
+# --- CONFIG ---
+VALUE_THRESHOLD = 0.02   # Same edge the dashboard demands before it acts
+KELLY_DIVISOR = 8        # 1/8 Kelly for professional safety
+MIN_STAKE = 0.20
+FEED_HOST = '127.0.0.1'
+FEED_PORT = 9009
+
+# Replay tool: bookmaker margin over the model's fair price, pull-back speed
+# towards that price per tick, and the size of each random shock (log-odds)
+REPLAY_MARGIN = 0.05
+REPLAY_REVERSION = 0.2
+REPLAY_SHOCK = 0.03
+
+# Every market the feed can price -> (brain, predict_proba column per selection)
+# The result brain orders its classes [Away, Draw, Home]
+MARKETS = {
+    '1X2': ('result', {'H': 2, 'D': 1, 'A': 0}),
+    'OU25': ('goals', {'OVER': 1, 'UNDER': 0}),
+    'BTTS': ('btts', {'YES': 1, 'NO': 0}),
+    'CORNERS': ('corners', {'OVER': 1, 'UNDER': 0}),
+}
+
+def fixture_key(home, away):
+    return f"{home} vs {away}"
+
+
+class ProbabilityCache:
+    # Model probabilities only change when the brains or the snapshot change,
+    # so we price every fixture once (one predict_proba per brain) and reuse it
+    # for every odds tick that follows.
+    def __init__(self, brains, elo, stats):
+        self.brains = brains
+        self.elo = elo
+        self.stats = stats
+        self.probs = {}
+
+    def warm(self, pairs):
+        pairs = [p for p in pairs if fixture_key(*p) not in self.probs]
+        if not pairs:
+            return
+        feats = build_matrix(pairs, self.elo, self.stats)
+        raw = {name: brain.predict_proba(feats) for name, brain in self.brains.items()}
+        for i, (home, away) in enumerate(pairs):
+            table = {}
+            for market, (brain, columns) in MARKETS.items():
+                for selection, col in columns.items():
+                    table[(market, selection)] = float(raw[brain][i][col])
+            self.probs[fixture_key(home, away)] = table
+
+    def known(self, team):
+        return team in self.elo and team in self.stats
+
+    def get(self, fixture, home=None, away=None):
+        table = self.probs.get(fixture)
+        if table is None and self.known(home) and self.known(away):
+            # A fixture that was not in upcoming_matches.json: price it on demand.
+            # Unknown (or misspelt) teams would only get Elo 1500 and league
+            # averages, which is not a price worth alerting on, so they stay None
+            self.warm([(home, away)])
+            table = self.probs.get(fixture)
+        return table
+
+
+def kelly_stake(prob, odds, balance):
+    b = odds - 1
+    if b <= 0:
+        return 0.0
+    kelly = ((b * prob) - (1 - prob)) / b
+    if kelly <= 0:
+        return 0.0
+    return max(MIN_STAKE, (kelly / KELLY_DIVISOR) * balance)
+
+
+class OddsBook:
+    # Latest price per (fixture, market, selection). An update only touches
+    # its own key, so the cost per tick is constant no matter how many
+    # fixtures and markets are being tracked.
+    def __init__(self, cache, balance, threshold=VALUE_THRESHOLD):
+        self.cache = cache
+        self.balance = balance
+        self.threshold = threshold
+        self.prices = {}
+        self.edges = {}
+        self.in_value = set()
+
+    def apply(self, fixture, market, selection, odds, home=None, away=None):
+        # Raises KeyError for a fixture/selection we cannot price, so the
+        # consumer counts it as rejected instead of as an update
+        table = self.cache.get(fixture, home, away)
+        if table is None or (market, selection) not in table:
+            raise KeyError((fixture, market, selection))
+        prob = table[(market, selection)]
+
+        key = (fixture, market, selection)
+        if self.prices.get(key) == odds:
+            return None
+        self.prices[key] = odds
+
+        edge = (prob * odds) - 1
+        stake = kelly_stake(prob, odds, self.balance) if edge > 0 else 0.0
+        self.edges[key] = (edge, stake)
+
+        # Alert only when the edge crosses the threshold, not on every tick
+        if edge > self.threshold and key not in self.in_value:
+            self.in_value.add(key)
+            return ('VALUE', key, prob, odds, edge, stake)
+        if edge <= self.threshold and key in self.in_value:
+            self.in_value.discard(key)
+            return ('GONE', key, prob, odds, edge, stake)
+        return None
+
+    def best(self, n=10):
+        live = [(self.edges[k][0], k) for k in self.in_value]
+        live.sort(reverse=True)
+        return [(k, self.prices[k], edge, self.edges[k][1]) for edge, k in live[:n]]
+
+
+# --- FEED SOURCES (both yield raw JSON lines) ---
+def read_file(path, follow=False):
+    with open(path, 'r') as f:
+        while True:
+            line = f.readline()
+            if line:
+                yield line
+            elif follow:
+                time.sleep(0.05)
+            else:
+                return
+
+
+def read_socket(host, port):
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((host, port))
+    server.listen(1)
+    print(f"📡 Waiting for odds feed on {host}:{port} ...")
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile('r') as stream:
+                for line in stream:
+                    yield line
+    finally:
+        server.close()
+
+
+def print_alert(alert):
+    kind, (fixture, market, selection), prob, odds, edge, stake = alert
+    if kind == 'VALUE':
+        print(f"✅ VALUE {fixture} | {market} {selection} @ {odds:.2f} | AI {prob:.1%} | Edge {edge:.1%} | Stake {stake:.2f}")
+    else:
+        print(f"❌ GONE  {fixture} | {market} {selection} @ {odds:.2f} | Edge {edge:.1%}")
+
+
+def run_consumer(lines, balance, threshold, quiet=False):
+    brains, elo, stats, fixtures = load_assets()
+    cache = ProbabilityCache(brains, elo, stats)
+    cache.warm([(m['home'], m['away']) for m in fixtures])
+    book = OddsBook(cache, balance, threshold)
+
+    updates, alerts, bad = 0, 0, 0
+    start = time.perf_counter()
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                msg = json.loads(line)
+                home, away = msg.get('home'), msg.get('away')
+                fixture = msg.get('fixture') or fixture_key(home, away)
+                alert = book.apply(fixture, msg['market'], str(msg['selection']).upper(),
+                                   float(msg['odds']), home, away)
+            except (ValueError, KeyError, TypeError):
+                bad += 1
+                continue
+            updates += 1
+            if alert:
+                alerts += 1
+                if not quiet:
+                    print_alert(alert)
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.perf_counter() - start
+
+    print(f"\n--- FEED SUMMARY ---")
+    print(f"Updates: {updates} | Alerts: {alerts} | Rejected: {bad}")
+    if elapsed > 0:
+        print(f"Throughput: {updates / elapsed:,.0f} updates/sec")
+    print("\n--- 🏆 LIVE VALUE BOARD ---")
+    for (fixture, market, selection), odds, edge, stake in book.best():
+        print(f"{fixture} | {market} {selection} @ {odds:.2f} | Edge {edge:.1%} | Stake {stake:.2f}")
+
+
+# --- REPLAY TOOL ---
+def make_replay(path, n_updates, seed=1):
+    # Prices wander around the model's fair book (plus a bookmaker margin) and
+    # are pulled back towards it on every tick, so edges stay realistic no
+    # matter how long the replay runs
+    brains, elo, stats, fixtures = load_assets()
+    cache = ProbabilityCache(brains, elo, stats)
+    cache.warm([(m['home'], m['away']) for m in fixtures])
+    rng = random.Random(seed)
+
+    anchors, log_prices = {}, {}
+    for m in fixtures:
+        table = cache.get(fixture_key(m['home'], m['away']))
+        for market, (_, columns) in MARKETS.items():
+            for selection in columns:
+                key = (m['home'], m['away'], market, selection)
+                prob = min(max(table[(market, selection)], 0.01), 0.99)
+                anchors[key] = np.log(max(1.01, 1 / (prob * (1 + REPLAY_MARGIN))))
+                log_prices[key] = anchors[key] + rng.gauss(0, REPLAY_SHOCK)
+    keys = list(anchors)
+
+    prices = {}
+    with open(path, 'w') as f:
+        for _ in range(n_updates):
+            key = rng.choice(keys)
+            log_prices[key] += REPLAY_REVERSION * (anchors[key] - log_prices[key]) + rng.gauss(0, REPLAY_SHOCK)
+            prices[key] = round(max(1.01, float(np.exp(log_prices[key]))), 2)
+            home, away, market, selection = key
+            f.write(json.dumps({'home': home, 'away': away, 'market': market,
+                                'selection': selection, 'odds': prices[key]}) + '\n')
+    print(f"✅ Replay saved: {n_updates} price updates -> {path}")
+
+
+def send_replay(path, host, port, rate):
+    # rate = updates per second (0 = as fast as the socket allows)
+    with socket.create_connection((host, port)) as conn, open(path, 'rb') as f:
+        sent = 0
+        start = time.perf_counter()
+        for line in f:
+            conn.sendall(line)
+            sent += 1
+            if rate:
+                ahead = sent / rate - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+    print(f"📤 Sent {sent} updates in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Odds feed consumer with incremental edge recomputation")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    consume = sub.add_parser('consume', help="Read a price stream and alert on value")
+    consume.add_argument('--file', help="JSONL price file (omit to listen on a socket)")
+    consume.add_argument('--follow', action='store_true', help="Keep tailing the file")
+    consume.add_argument('--port', type=int, default=FEED_PORT)
+    consume.add_argument('--balance', type=float, default=100.0)
+    consume.add_argument('--threshold', type=float, default=VALUE_THRESHOLD)
+    consume.add_argument('--quiet', action='store_true', help="Only print the summary")
+
+    replay = sub.add_parser('replay', help="Generate or stream a recorded price file")
+    replay.add_argument('--out', default='odds_replay.jsonl')
+    replay.add_argument('--updates', type=int, default=100000)
+    replay.add_argument('--send', action='store_true', help="Stream the file to a listening consumer")
+    replay.add_argument('--port', type=int, default=FEED_PORT)
+    replay.add_argument('--rate', type=float, default=0, help="Updates per second (0 = unthrottled)")
+
+    args = parser.parse_args()
+    if args.command == 'consume':
+        lines = read_file(args.file, args.follow) if args.file else read_socket(FEED_HOST, args.port)
+        run_consumer(lines, args.balance, args.threshold, args.quiet)
+    elif args.send:
+        send_replay(args.out, FEED_HOST, args.port, args.rate)
+    else:
+        make_replay(args.out, args.updates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import json
+import math
+import time
+import asyncio
+import argparse
+from collections import OrderedDict
+import numpy as np
+from match_features import load_assets, build_features
+
+# --- CONFIG ---
+HOST = '127.0.0.1'
+PORT = 8765
+BATCH_WINDOW = 0.004     # Seconds to wait for other requests to join a batch
+MAX_BATCH = 512          # Rows per predict_proba call
+CACHE_SIZE = 4096        # Feature vectors remembered by the LRU cache
+
+LATENCY_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000]
+BATCH_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+
+
+# --- METRICS ---
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # Last slot is "+Inf"
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        for i, edge in enumerate(self.buckets):
+            if value <= edge:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self):
+        labels = [f"<={b}" for b in self.buckets] + ["+Inf"]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class LRUCache:
+    def __init__(self, size):
+        self.size = size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.size:
+            self.data.popitem(last=False)
+
+
+# --- INFERENCE ---
+def to_prediction(raw):
+    # raw holds one predict_proba row per brain. Result order is [Away, Draw, Home]
+    res = raw['result']
+    return {
+        'home_win': float(res[2]), 'draw': float(res[1]), 'away_win': float(res[0]),
+        'over25': float(raw['goals'][1]),
+        'btts': float(raw['btts'][1]),
+        'corners_over95': float(raw['corners'][1]),
+    }
+
+
+class MicroBatcher:
+    # Requests that arrive inside the same BATCH_WINDOW are stacked into one
+    # matrix so each brain runs a single predict_proba for all of them.
+    def __init__(self, brains, cache, batch_hist):
+        self.brains = brains
+        self.cache = cache
+        self.batch_hist = batch_hist
+        self.queue = asyncio.Queue()
+
+    async def predict(self, feats):
+        hit = self.cache.get(feats)
+        if hit is not None:
+            return hit, True
+        fut = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((feats, fut))
+        return await fut, False
+
+    def _infer(self, rows):
+        X = np.array(rows, dtype=float)
+        raw = {name: brain.predict_proba(X) for name, brain in self.brains.items()}
+        return [to_prediction({name: probs[i] for name, probs in raw.items()}) for i in range(len(rows))]
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(BATCH_WINDOW)
+            while len(batch) < MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            # Identical vectors inside one batch are only inferred once
+            waiting = OrderedDict()
+            for feats, fut in batch:
+                waiting.setdefault(feats, []).append(fut)
+            rows = list(waiting)
+            self.batch_hist.observe(len(rows))
+
+            try:
+                # Forests release the GIL, so the event loop keeps accepting requests
+                preds = await loop.run_in_executor(None, self._infer, rows)
+            except Exception:
+                # One bad row must not fail everyone else's request: retry the
+                # rows one at a time so only the offending one gets the error
+                preds = []
+                for feats in rows:
+                    try:
+                        preds.append((await loop.run_in_executor(None, self._infer, [feats]))[0])
+                    except Exception as e:
+                        preds.append(e)
+
+            for feats, pred in zip(rows, preds):
+                failed = isinstance(pred, Exception)
+                if not failed:
+                    self.cache.put(feats, pred)
+                for fut in waiting[feats]:
+                    if not fut.done():
+                        if failed:
+                            fut.set_exception(pred)
+                        else:
+                            fut.set_result(pred)
+
+
+# --- HTTP SERVICE ---
+class PredictionService:
+    def __init__(self):
+        brains, self.elo, self.stats, self.fixtures = load_assets()
+        self.cache = LRUCache(CACHE_SIZE)
+        self.latency = Histogram(LATENCY_BUCKETS_MS)
+        self.batch_sizes = Histogram(BATCH_BUCKETS)
+        self.batcher = MicroBatcher(brains, self.cache, self.batch_sizes)
+        self.requests = 0
+        self.errors = 0
+
+    async def predict_one(self, item):
+        if 'features' in item:
+            feats = tuple(float(v) for v in item['features'])
+            if len(feats) != 10:
+                raise ValueError("features must hold exactly 10 values")
+            if not all(math.isfinite(v) for v in feats):
+                raise ValueError("features must all be finite numbers")
+        else:
+            feats = tuple(build_features(item['home'], item['away'], self.elo, self.stats))
+        pred, cached = await self.batcher.predict(feats)
+        out = {k: item[k] for k in ('home', 'away') if k in item}
+        out.update(pred)
+        out['cached'] = cached
+        return out
+
+    async def route(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics()
+        if method == 'GET' and path == '/fixtures':
+            items = [{'home': m['home'], 'away': m['away']} for m in self.fixtures]
+            return 200, {'predictions': await asyncio.gather(*[self.predict_one(i) for i in items])}
+        if method == 'POST' and path == '/predict':
+            payload = json.loads(body or b'{}')
+            items = payload['fixtures'] if 'fixtures' in payload else [payload]
+            return 200, {'predictions': await asyncio.gather(*[self.predict_one(i) for i in items])}
+        return 404, {'error': f"no route for {method} {path}"}
+
+    def metrics(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': self.latency.to_dict(),
+            'batch_size': self.batch_sizes.to_dict(),
+            'cache': {'size': len(self.cache.data), 'hits': self.cache.hits, 'misses': self.cache.misses},
+        }
+
+    async def respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'ERROR'}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                self.requests += 1
+                try:
+                    lines = head.decode('latin-1').split('\r\n')
+                    method, path, version = lines[0].split(' ', 2)
+                    headers = {}
+                    for line in lines[1:]:
+                        if ':' in line:
+                            k, v = line.split(':', 1)
+                            headers[k.strip().lower()] = v.strip()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                except ValueError as e:
+                    # We cannot tell where this request ends, so answer and hang up
+                    self.errors += 1
+                    await self.respond(writer, 400, {'error': f"malformed request: {e}"}, False)
+                    break
+                try:
+                    body = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                try:
+                    status, payload = await self.route(method, path.split('?')[0], body)
+                except (ValueError, KeyError, TypeError) as e:
+                    self.errors += 1
+                    status, payload = 400, {'error': str(e)}
+                except Exception as e:
+                    self.errors += 1
+                    status, payload = 500, {'error': str(e)}
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                await self.respond(writer, status, payload, keep_alive)
+                if path != '/metrics':
+                    self.latency.observe((time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+async def serve(host, port):
+    service = PredictionService()
+    batcher_task = asyncio.create_task(service.batcher.run())
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"🛰️ Prediction service live on http://{host}:{port}  (POST /predict, GET /fixtures, GET /metrics)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher_task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local JSON prediction service with micro-batched inference")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n🛑 Prediction service stopped.")
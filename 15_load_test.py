@@ -0,0 +1,100 @@
+import json
+import time
+import random
+import asyncio
+import argparse
+from state_snapshot import load_state
+
+# --- CONFIG ---
+HOST = '127.0.0.1'
+PORT = 8765
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+def body_source(unique, fixtures, seed):
+    # Named fixtures hit the LRU cache after the first request. --unique builds
+    # a fresh random feature vector for every single request, so nothing can be
+    # served from the cache and every request has to go through the forests
+    rng = random.Random(seed)
+    if unique:
+        return lambda: json.dumps({'features': [
+            rng.uniform(1300, 1700), rng.uniform(1300, 1700),
+            rng.uniform(0.5, 2.5), rng.uniform(0.5, 2.5), rng.uniform(3, 8), rng.uniform(3, 8),
+            rng.uniform(0.05, 0.2), rng.uniform(0.05, 0.2), rng.uniform(0.2, 0.8), rng.uniform(0.2, 0.8)
+        ]}).encode()
+    bodies = [json.dumps({'home': m['home'], 'away': m['away']}).encode() for m in fixtures]
+    return lambda: rng.choice(bodies)
+
+
+async def request(reader, writer, method, path, body=b''):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = 0
+    for line in head.decode('latin-1').split('\r\n'):
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    return json.loads(await reader.readexactly(length))
+
+
+async def worker(host, port, next_body, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            body = next_body()
+            start = time.perf_counter()
+            await request(reader, writer, 'POST', '/predict', body)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, unique, fixtures, concurrency, duration):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    # Every worker at every level gets its own seed, so no two streams repeat
+    await asyncio.gather(*[
+        worker(host, port, body_source(unique, fixtures, concurrency * 1000 + w), deadline, latencies)
+        for w in range(concurrency)
+    ])
+    latencies.sort()
+    n = len(latencies)
+    return {
+        'rps': n / duration,
+        'p50': latencies[n // 2] * 1000 if n else 0.0,
+        'p99': latencies[min(n - 1, int(n * 0.99))] * 1000 if n else 0.0,
+    }
+
+
+async def run_load_test(host, port, duration, unique):
+    fixtures = [] if unique else load_state().fixtures
+    print(f"--- 🔥 LOAD TEST: {host}:{port} ({'unique vectors' if unique else 'fixture list'}) ---")
+    print(f"{'Clients':>8} | {'Req/s':>9} | {'p50 ms':>8} | {'p99 ms':>8} | {'Avg batch':>9} | {'Cache hits':>10}")
+
+    reader, writer = await asyncio.open_connection(host, port)
+    last = await request(reader, writer, 'GET', '/metrics')
+    for level in CONCURRENCY_LEVELS:
+        result = await run_level(host, port, unique, fixtures, level, duration)
+        now = await request(reader, writer, 'GET', '/metrics')
+        # Average rows per predict_proba call and cache hits during this level only
+        batches = now['batch_size']['count'] - last['batch_size']['count']
+        rows = (now['batch_size']['mean'] * now['batch_size']['count']
+                - last['batch_size']['mean'] * last['batch_size']['count'])
+        hits = now['cache']['hits'] - last['cache']['hits']
+        last = now
+        avg_batch = rows / batches if batches else 0.0
+        print(f"{level:>8} | {result['rps']:>9.0f} | {result['p50']:>8.2f} | {result['p99']:>8.2f} | {avg_batch:>9.1f} | {hits:>10}")
+    writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput vs concurrency for 14_prediction_server.py")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument('--unique', action='store_true', help="Bypass the LRU cache with random feature vectors")
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.host, args.port, args.duration, args.unique))
@@ -0,0 +1,103 @@
+import io
+import os
+import time
+import importlib
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import log_loss, accuracy_score
+
+# Reuse the exact feature list, targets and engine settings the trainers use
+pro = importlib.import_module('9_train_pro_models')
+legacy = importlib.import_module('5_train_ai')
+
+ENGINES = ['forest', 'hgb']
+LATENCY_CALLS = 200     # Single-fixture predict_proba calls to time (the app's use case)
+
+
+def pickle_size(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell()
+
+
+def tree_count(model):
+    # Forests: one tree per estimator. Boosting builds one tree per class per
+    # iteration for multi-class targets (3 for the result brain)
+    if hasattr(model, 'estimators_'):
+        return len(model.estimators_)
+    return model.n_iter_ * model.n_trees_per_iteration_
+
+
+def time_inference(model, X):
+    row = X[:1]
+    model.predict_proba(row)   # Warm-up
+    start = time.perf_counter()
+    for _ in range(LATENCY_CALLS):
+        model.predict_proba(row)
+    single_ms = (time.perf_counter() - start) / LATENCY_CALLS * 1000
+
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batch_us = (time.perf_counter() - start) / len(X) * 1e6
+    return single_ms, batch_us
+
+
+def compare(label, df, features, target, make_model):
+    # Same time-ordered 80/20 split as 5_train_ai.py: train on the past, test on the future
+    train_size = int(len(df) * 0.8)
+    train, test = df.iloc[:train_size], df.iloc[train_size:]
+    X_test = test[features].to_numpy(dtype=float)
+
+    rows = []
+    for engine in ENGINES:
+        model = make_model(engine)
+        start = time.perf_counter()
+        model.fit(train[features], train[target])
+        fit_s = time.perf_counter() - start
+
+        probs = model.predict_proba(X_test)
+        single_ms, batch_us = time_inference(model, X_test)
+        rows.append({
+            'Brain': label,
+            'Engine': engine,
+            'Trees': tree_count(model),
+            'Train (s)': round(fit_s, 2),
+            'Size (MB)': round(pickle_size(model) / 1e6, 2),
+            'Predict 1 (ms)': round(single_ms, 3),
+            'Predict batch (us/row)': round(batch_us, 2),
+            'Log-loss': round(log_loss(test[target], probs, labels=model.classes_), 4),
+            'Accuracy': round(accuracy_score(test[target], model.classes_[np.argmax(probs, axis=1)]), 4),
+        })
+    return rows
+
+
+def run_report():
+    results = []
+
+    if os.path.exists('master_training_data.csv'):
+        df = pd.read_csv('master_training_data.csv')
+        for name, target in pro.TARGETS.items():
+            print(f"⏱️ Benchmarking {name} brain...")
+            results += compare(name, df, pro.FEATURES, target, pro.make_model)
+    else:
+        print("⚠️ master_training_data.csv not found. Run 8_pro_preprocessor.py first.")
+
+    if os.path.exists('training_data.csv'):
+        df = pd.read_csv('training_data.csv')
+        print("⏱️ Benchmarking legacy football_ai brain...")
+        predictors = ['Home_Elo_Pre', 'Away_Elo_Pre', 'Home_Shots_Avg', 'Away_Shots_Avg']
+        results += compare('legacy', df, predictors, 'Target', legacy.make_model)
+
+    if not results:
+        return
+
+    report = pd.DataFrame(results)
+    print("\n--- ⚔️ ENGINE REPORT: RandomForest vs HistGradientBoosting ---")
+    print(report.to_string(index=False))
+    report.to_csv('engine_report.csv', index=False)
+    print("\nReport saved as: engine_report.csv")
+
+
+if __name__ == "__main__":
+    run_report()
@@ -0,0 +1,300 @@
+import json
+import math
+import time
+import queue
+import random
+import argparse
+import importlib
+import threading
+import numpy as np
+from state_snapshot import load_state
+from match_features import get_safe_stats
+
+# Same file-tail and socket sources as the odds feed consumer
+feed = importlib.import_module('13_odds_feed')
+
+# --- CONFIG ---
+MATCH_MINUTES = 90
+MAX_GOALS = 10          # Remaining-goal grid per team (mass beyond 10 is negligible)
+HOME_ADV = 55           # Same Elo home advantage as the value finders
+ELO_GOAL_SCALE = 1600   # Every 1600 Elo points of gap = 10x goal-rate ratio
+RED_OWN = 0.67          # Scoring rate kept by a side that goes down to 10 men
+RED_OPP = 1.25          # Scoring rate boost for their opponent
+BATCH_EVENTS = 1024     # Most events applied before one vectorised re-price
+FLUSH_SECONDS = 0.05    # Longest an event waits for its re-price while input keeps coming
+LIVE_PORT = 9010
+
+# Event types the feed may send; goals and red cards must name a side
+EVENT_TYPES = ('kickoff', 'goal', 'red', 'tick', 'end')
+TEAMS = ('home', 'away')
+
+# State columns (one row per match in progress)
+BASE_H, BASE_A, MULT_H, MULT_A, MINUTE, GOALS_H, GOALS_A = range(7)
+# Probability columns
+P_HOME, P_DRAW, P_AWAY, P_OVER25, P_BTTS = range(5)
+
+_K = np.arange(MAX_GOALS + 1)
+_FACT = np.array([math.factorial(k) for k in _K], dtype=float)
+_MARGIN = _K[:, None] - _K[None, :]     # home_remaining - away_remaining
+
+
+def poisson_pmf(lam):
+    # lam shape (m,) -> pmf shape (m, MAX_GOALS + 1)
+    lam = lam[:, None]
+    return np.exp(-lam) * lam ** _K / _FACT
+
+
+def prematch_rates(home, away, elo, stats):
+    # Full-match expected goals: each side's recent scoring rate, tilted by the Elo gap
+    diff = (elo.get(home, 1500) + HOME_ADV) - elo.get(away, 1500)
+    tilt = 10 ** (diff / ELO_GOAL_SCALE)
+    return (get_safe_stats(stats, home)['goals'] * tilt,
+            get_safe_stats(stats, away)['goals'] / tilt)
+
+
+class LiveBook:
+    # Every match in progress is one row of a numpy table. An event only
+    # touches a few cells of its own row and flags it dirty; reprice() then
+    # recomputes all dirty rows together from the time-remaining Poisson rates.
+    def __init__(self, capacity=64):
+        self.index = {}
+        self.names = []
+        self.state = np.zeros((capacity, 7))
+        self.probs = np.zeros((capacity, 5))
+        self.dirty = np.zeros(capacity, dtype=bool)
+
+    def add_match(self, match_id, lam_home, lam_away):
+        if match_id in self.index:
+            return self.index[match_id]
+        i = len(self.names)
+        if i == len(self.state):
+            self.state = np.concatenate([self.state, np.zeros_like(self.state)])
+            self.probs = np.concatenate([self.probs, np.zeros_like(self.probs)])
+            self.dirty = np.concatenate([self.dirty, np.zeros_like(self.dirty)])
+        self.index[match_id] = i
+        self.names.append(match_id)
+        self.state[i] = [lam_home, lam_away, 1.0, 1.0, 0, 0, 0]
+        self.dirty[i] = True
+        return i
+
+    def apply(self, match_id, kind, team=None, minute=None):
+        # Returns False (rejected) for unknown matches, unknown event types and
+        # goals/red cards that do not say which side they belong to
+        i = self.index.get(match_id)
+        if i is None or kind not in EVENT_TYPES:
+            return False
+        if kind in ('goal', 'red') and team not in TEAMS:
+            return False
+        row = self.state[i]
+        if minute is not None and minute > row[MINUTE]:
+            row[MINUTE] = minute
+        if kind == 'goal':
+            row[GOALS_H if team == 'home' else GOALS_A] += 1
+        elif kind == 'red':
+            own, opp = (MULT_H, MULT_A) if team == 'home' else (MULT_A, MULT_H)
+            row[own] *= RED_OWN
+            row[opp] *= RED_OPP
+        elif kind == 'end':
+            row[MINUTE] = max(row[MINUTE], MATCH_MINUTES)
+        self.dirty[i] = True
+        return True
+
+    def reprice(self):
+        rows = np.flatnonzero(self.dirty[:len(self.names)])
+        if len(rows) == 0:
+            return rows
+        s = self.state[rows]
+        left = np.clip(MATCH_MINUTES - s[:, MINUTE], 0, None) / MATCH_MINUTES
+        lam_h = s[:, BASE_H] * s[:, MULT_H] * left
+        lam_a = s[:, BASE_A] * s[:, MULT_A] * left
+        gh, ga = s[:, GOALS_H], s[:, GOALS_A]
+
+        # 1X2: joint grid of remaining goals, shifted by the current score
+        joint = poisson_pmf(lam_h)[:, :, None] * poisson_pmf(lam_a)[:, None, :]
+        margin = (gh - ga)[:, None, None] + _MARGIN[None]
+        p = self.probs
+        p[rows, P_HOME] = (joint * (margin > 0)).sum(axis=(1, 2))
+        p[rows, P_DRAW] = (joint * (margin == 0)).sum(axis=(1, 2))
+        p[rows, P_AWAY] = (joint * (margin < 0)).sum(axis=(1, 2))
+
+        # Over 2.5: remaining total is Poisson(lam_h + lam_a)
+        need = (3 - (gh + ga)).astype(int)
+        cdf = np.cumsum(poisson_pmf(lam_h + lam_a), axis=1)
+        below = cdf[np.arange(len(rows)), np.clip(need - 1, 0, MAX_GOALS)]
+        p[rows, P_OVER25] = np.where(need <= 0, 1.0, 1.0 - below)
+
+        # BTTS: each side has scored already or scores at least once more
+        h_scores = np.where(gh > 0, 1.0, 1.0 - np.exp(-lam_h))
+        a_scores = np.where(ga > 0, 1.0, 1.0 - np.exp(-lam_a))
+        p[rows, P_BTTS] = h_scores * a_scores
+
+        self.dirty[rows] = False
+        return rows
+
+    def line(self, i):
+        s, p = self.state[i], self.probs[i]
+        return (f"{self.names[i]} {int(s[GOALS_H])}-{int(s[GOALS_A])} ({int(s[MINUTE])}') | "
+                f"H {p[P_HOME]:.1%} D {p[P_DRAW]:.1%} A {p[P_AWAY]:.1%} | "
+                f"O2.5 {p[P_OVER25]:.1%} | BTTS {p[P_BTTS]:.1%}")
+
+
+def load_snapshot():
+    state = load_state()
+    return state.elo, state.stats, state.fixtures
+
+
+def read_batches(lines, size=BATCH_EVENTS, flush=FLUSH_SECONDS):
+    # The source (file, tailed file or socket) is read on its own thread. A batch
+    # is handed over as soon as nothing more is ready, after `flush` seconds or
+    # at `size` events, whichever comes first, so a quiet feed never leaves
+    # events waiting for a full batch.
+    q = queue.Queue(maxsize=size * 4)
+    done = object()
+    errors = []
+
+    def pump():
+        try:
+            for line in lines:
+                q.put(line)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            q.put(done)
+
+    threading.Thread(target=pump, daemon=True).start()
+    while True:
+        line = q.get()
+        if line is done:
+            break
+        batch, deadline = [line], time.perf_counter() + flush
+        while len(batch) < size and time.perf_counter() < deadline:
+            try:
+                line = q.get_nowait()
+            except queue.Empty:
+                break
+            if line is done:
+                q.put(done)
+                break
+            batch.append(line)
+        yield batch
+    if errors:
+        raise errors[0]
+
+
+def run_live(lines, quiet=False):
+    elo, stats, fixtures = load_snapshot()
+    book = LiveBook()
+    for m in fixtures:
+        book.add_match(f"{m['home']} vs {m['away']}", *prematch_rates(m['home'], m['away'], elo, stats))
+    book.reprice()
+
+    events, rejected, batches = 0, 0, 0
+    apply_s, price_s = 0.0, 0.0
+    try:
+        for batch in read_batches(lines):
+            start = time.perf_counter()
+            for line in batch:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ev = json.loads(line)
+                    match_id = ev['match']
+                    if ev['type'] == 'kickoff' and 'home' in ev:
+                        book.add_match(match_id, *prematch_rates(ev['home'], ev['away'], elo, stats))
+                    if book.apply(match_id, ev['type'], ev.get('team'), ev.get('minute')):
+                        events += 1
+                    else:
+                        rejected += 1
+                except (ValueError, KeyError, TypeError):
+                    rejected += 1
+            mid = time.perf_counter()
+            changed = book.reprice()
+            price_s += time.perf_counter() - mid
+            apply_s += mid - start
+            batches += 1
+            if not quiet:
+                for i in changed:
+                    print(book.line(i))
+    except KeyboardInterrupt:
+        pass
+
+    print(f"\n--- ⏱️ LIVE ENGINE BENCHMARK ---")
+    print(f"Events: {events} | Rejected: {rejected} | Matches: {len(book.names)} | Batches: {batches}")
+    if events:
+        print(f"Apply:   {apply_s / events * 1e6:.2f} us/event (parse + state update)")
+        print(f"Reprice: {price_s / events * 1e6:.2f} us/event ({price_s / max(batches, 1) * 1e3:.3f} ms per batch)")
+        print(f"Total:   {events / (apply_s + price_s):,.0f} events/sec")
+
+    print("\n--- 📺 FINAL BOARD ---")
+    for i in range(min(len(book.names), 20)):
+        print(book.line(i))
+
+
+# --- REPLAY TOOL ---
+def simulate_timelines(path, copies=1, seed=1):
+    # Play every upcoming fixture minute by minute from its pre-match rates and
+    # interleave all matches by minute, the way a real matchday feed arrives
+    elo, stats, fixtures = load_snapshot()
+    rng = random.Random(seed)
+
+    matches = []
+    for c in range(copies):
+        for m in fixtures:
+            match_id = f"{m['home']} vs {m['away']}" + (f" #{c}" if c else "")
+            lam_h, lam_a = prematch_rates(m['home'], m['away'], elo, stats)
+            matches.append([match_id, m['home'], m['away'], lam_h, lam_a])
+
+    n_events = 0
+    with open(path, 'w') as f:
+        for match_id, home, away, _, _ in matches:
+            f.write(json.dumps({'match': match_id, 'type': 'kickoff', 'home': home, 'away': away, 'minute': 0}) + '\n')
+            n_events += 1
+        for minute in range(1, MATCH_MINUTES + 1):
+            for match in matches:
+                match_id, _, _, lam_h, lam_a = match
+                for team, lam, col in (('home', lam_h, 3), ('away', lam_a, 4)):
+                    if rng.random() < lam / MATCH_MINUTES:
+                        f.write(json.dumps({'match': match_id, 'type': 'goal', 'team': team, 'minute': minute}) + '\n')
+                        n_events += 1
+                    if rng.random() < 0.1 / MATCH_MINUTES:
+                        f.write(json.dumps({'match': match_id, 'type': 'red', 'team': team, 'minute': minute}) + '\n')
+                        n_events += 1
+                        match[col] *= RED_OWN
+                        match[7 - col] *= RED_OPP
+                f.write(json.dumps({'match': match_id, 'type': 'tick', 'minute': minute}) + '\n')
+                n_events += 1
+        for match_id, _, _, _, _ in matches:
+            f.write(json.dumps({'match': match_id, 'type': 'end', 'minute': MATCH_MINUTES}) + '\n')
+            n_events += 1
+    print(f"✅ Timeline saved: {len(matches)} matches, {n_events} events -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-play win-probability engine")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    live = sub.add_parser('live', help="Price matches from a JSONL event feed")
+    live.add_argument('--events', default='live_events.jsonl', help="JSONL event file")
+    live.add_argument('--follow', action='store_true', help="Keep tailing the event file")
+    live.add_argument('--listen', action='store_true', help="Read events from a socket instead of a file")
+    live.add_argument('--port', type=int, default=LIVE_PORT)
+    live.add_argument('--quiet', action='store_true', help="Only print the benchmark and final board")
+
+    replay = sub.add_parser('replay', help="Simulate recorded match timelines for a benchmark")
+    replay.add_argument('--out', default='live_events.jsonl')
+    replay.add_argument('--copies', type=int, default=1, help="Copies of the fixture list to run at once")
+
+    args = parser.parse_args()
+    if args.command == 'live':
+        if args.listen:
+            lines = feed.read_socket(feed.FEED_HOST, args.port)
+        else:
+            lines = feed.read_file(args.events, args.follow)
+        run_live(lines, args.quiet)
+    else:
+        simulate_timelines(args.out, args.copies)
+
+
+if __name__ == "__main__":
+    main()
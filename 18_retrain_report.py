@@ -0,0 +1,90 @@
+import sys
+import copy
+import time
+import importlib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import log_loss, accuracy_score
+
+# Same features, targets, forest settings and sliding-window rules as the trainer
+pro = importlib.import_module('9_train_pro_models')
+
+SIM_SEASONS = 2      # Replay the last N seasons week by week
+TARGET = 'result'    # Brain to simulate (python 18_retrain_report.py goals)
+
+
+def season_of(dates):
+    # Football seasons run August to May: Jan 2024 belongs to the 2023 season
+    return dates.dt.year - (dates.dt.month < 7)
+
+
+def score(model, week, target):
+    probs = model.predict_proba(week[pro.FEATURES])
+    return (log_loss(week[target], probs, labels=model.classes_),
+            accuracy_score(week[target], model.classes_[np.argmax(probs, axis=1)]))
+
+
+def run_report(target_name=TARGET):
+    target = pro.TARGETS[target_name]
+    df = pd.read_csv('master_training_data.csv')
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.sort_values('Date', kind='mergesort').reset_index(drop=True)
+    df['Season'] = season_of(df['Date'])
+
+    seasons = sorted(df['Season'].unique())
+    if len(seasons) <= SIM_SEASONS:
+        print("❌ Not enough seasons of history to simulate.")
+        return
+    sim_start = df.index[df['Season'] == seasons[-SIM_SEASONS]][0]
+
+    # Both strategies start from the same full forest trained before the simulated seasons
+    full = pro.make_model('forest')
+    full.fit(df.iloc[:sim_start][pro.FEATURES], df.iloc[:sim_start][target])
+    incremental = copy.deepcopy(full)
+
+    weeks = df.iloc[sim_start:].groupby(df['Date'].iloc[sim_start:].dt.to_period('W'), sort=True)
+    rows = []
+    print(f"🔁 Simulating {len(weeks)} matchweeks of {target_name} across seasons {seasons[-SIM_SEASONS:]}...")
+    for period, week in weeks:
+        # 1. Score both brains on matches they have not seen yet
+        full_ll, full_acc = score(full, week, target)
+        inc_ll, inc_acc = score(incremental, week, target)
+
+        # 2. Then let each strategy learn the week
+        seen = df.iloc[:week.index[-1] + 1]
+        start = time.perf_counter()
+        full = pro.make_model('forest')
+        full.fit(seen[pro.FEATURES], seen[target])
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if not pro.grow_forest(incremental, seen.iloc[-pro.RECENT_WINDOW:], target, seed=len(seen)):
+            incremental = pro.make_model('forest')
+            incremental.fit(seen[pro.FEATURES], seen[target])
+        inc_s = time.perf_counter() - start
+
+        rows.append({
+            'Week': str(period), 'Season': int(week['Season'].iloc[0]), 'Matches': len(week),
+            'Full LogLoss': full_ll, 'Inc LogLoss': inc_ll,
+            'Full Acc': full_acc, 'Inc Acc': inc_acc,
+            'Full Retrain (s)': full_s, 'Inc Retrain (s)': inc_s,
+        })
+
+    report = pd.DataFrame(rows)
+    report.to_csv('retrain_report.csv', index=False)
+
+    # Match-weighted averages per season
+    print("\n--- 📊 INCREMENTAL vs FULL REBUILD ---")
+    for season, part in report.groupby('Season'):
+        w = part['Matches']
+        print(f"Season {season}/{(season + 1) % 100:02d}: "
+              f"LogLoss full {np.average(part['Full LogLoss'], weights=w):.4f} vs inc {np.average(part['Inc LogLoss'], weights=w):.4f} | "
+              f"Acc full {np.average(part['Full Acc'], weights=w):.2%} vs inc {np.average(part['Inc Acc'], weights=w):.2%} | "
+              f"Retrain full {part['Full Retrain (s)'].sum():.1f}s vs inc {part['Inc Retrain (s)'].sum():.1f}s")
+    speedup = report['Full Retrain (s)'].sum() / max(report['Inc Retrain (s)'].sum(), 1e-9)
+    print(f"\nIncremental retraining was {speedup:.1f}x faster overall.")
+    print("Week-by-week detail saved as: retrain_report.csv")
+
+
+if __name__ == "__main__":
+    run_report(sys.argv[1] if len(sys.argv) > 1 else TARGET)
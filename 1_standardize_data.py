@@ -1,6 +1,8 @@
 import pandas as pd
+import numpy as np
 import glob
 import os
+import zlib
 
 # 1. Setup paths
 DATA_FOLDER = './data'
@@ -8,7 +10,8 @@ MASTER_FILE = 'master_data.csv'
 
 def standardize_work():
     # Find all CSV files in the data folder
-    all_files = glob.glob(os.path.join(DATA_FOLDER, "*.csv"))
+    # Sorted so the run is deterministic (later season files win on duplicates)
+    all_files = sorted(glob.glob(os.path.join(DATA_FOLDER, "*.csv")))
     
     if not all_files:
         print("Error: No CSV files found in /data folder!")
@@ -52,10 +55,23 @@ def standardize_work():
     master_df['HomeTeam'] = master_df['HomeTeam'].apply(normalize_names)
     master_df['AwayTeam'] = master_df['AwayTeam'].apply(normalize_names)
 
-    # 6. Sort by Date
-    master_df = master_df.sort_values(by='Date')
+    # 6. Sort by Date and drop fixtures that appear in two overlapping season files
+    master_df = master_df.sort_values(by=['Date', 'HomeTeam', 'AwayTeam'], kind='mergesort')
+    master_df = master_df.drop_duplicates(subset=['Date', 'HomeTeam', 'AwayTeam'], keep='last')
 
-    # 7. Save the Clean Dataset
+    # 7. Stable match_id: YYYYMMDD * 2^32 + CRC32("Home|Away")
+    # Built only from the fixture itself, so adding other matches (a rearranged
+    # game, a new division's file) never renumbers it. Ids increase with the date,
+    # so every later table (elo_history, training data) is sorted and joined on this key
+    day = master_df['Date'].dt.strftime('%Y%m%d').astype(np.int64)
+    pair = [zlib.crc32(f"{h}|{a}".encode('utf-8')) for h, a in zip(master_df['HomeTeam'], master_df['AwayTeam'])]
+    master_df.insert(0, 'match_id', day * (1 << 32) + np.array(pair, dtype=np.int64))
+    clashes = master_df[master_df['match_id'].duplicated(keep=False)]
+    if not clashes.empty:
+        raise ValueError(f"match_id collision between different fixtures:\n{clashes[['Date', 'HomeTeam', 'AwayTeam']]}")
+    master_df = master_df.sort_values('match_id')
+
+    # 8. Save the Clean Dataset
     master_df.to_csv(MASTER_FILE, index=False)
     
     print(f"--- Task 2 Complete ---")
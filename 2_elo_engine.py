@@ -1,5 +1,5 @@
 import pandas as pd
-import json
+from state_snapshot import update_state
 
 # Settings for a Professional League One Bot
 K_FACTOR = 20           # Speed of learning (20 is professional standard)
@@ -13,7 +13,7 @@ def update_elo():
     # Load our Master Data from Task 2
     df = pd.read_csv('master_data.csv')
     df['Date'] = pd.to_datetime(df['Date'])
-    df = df.sort_values('Date') # Crucial: Process history in order
+    df = df.sort_values('match_id') # Crucial: Process history in order (match_id follows the date)
 
     elo_ratings = {}
     
@@ -34,6 +34,7 @@ def update_elo():
 
         # Store ratings BEFORE the match
         row_elo = {
+            'match_id': row['match_id'],
             'Date': row['Date'],
             'HomeTeam': home_team,
             'AwayTeam': away_team,
@@ -62,9 +63,8 @@ def update_elo():
 
         elo_history.append(row_elo)
 
-    # Save Current Ratings for prediction phase
-    with open('current_elo.json', 'w') as f:
-        json.dump(elo_ratings, f)
+    # Save Current Ratings for prediction phase (runtime snapshot + current_elo.json export)
+    update_state(elo=elo_ratings)
 
     # Save detailed history for Task 4 (The ML Training)
     history_df = pd.DataFrame(elo_history)
@@ -1,4 +1,4 @@
-import json
+from state_snapshot import load_state
 
 # Professional Constants
 HOME_ADV = 55
@@ -28,8 +28,7 @@ def kelly_criterion(prob, odds, bankroll):
     return safe_fraction * bankroll
 
 def run_calculator():
-    with open('current_elo.json', 'r') as f:
-        elo = json.load(f)
+    elo = load_state().elo
 
     # Ask for your Bybit balance
     balance = float(input("Enter your current Bybit Wallet Balance ($): "))
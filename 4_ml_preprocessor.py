@@ -1,16 +1,18 @@
 import pandas as pd
 
 def create_features():
-    # Load our master data
-    df = pd.read_csv('master_data.csv')
+    # Load our master data (one row per match_id)
+    df = pd.read_csv('master_data.csv', index_col='match_id')
     df['Date'] = pd.to_datetime(df['Date'])
     
-    # Load Elo history we created in Task 3
-    elo_df = pd.read_csv('elo_history.csv')
-    elo_df['Date'] = pd.to_datetime(elo_df['Date'])
+    # Load Elo history we created in Task 3 (only the ratings, keyed by the same match_id)
+    elo_df = pd.read_csv('elo_history.csv', index_col='match_id', usecols=['match_id', 'Home_Elo_Pre', 'Away_Elo_Pre'])
     
-    # Merge Elo into our main data
-    df = pd.merge(df, elo_df, on=['Date', 'HomeTeam', 'AwayTeam'])
+    # Attach Elo to our main data. Both files share the same sorted match_id
+    # index, so this is an aligned join instead of a Date/Team hash merge
+    df = df.join(elo_df, how='inner')
+    if not df.index.is_unique:
+        raise ValueError("Duplicate match_id found. Re-run 1_standardize_data.py")
 
     # SIMPLE ML FEATURE: Rolling Shots on Target (Last 5 games)
     # This teaches the bot "Attacking Momentum"
@@ -33,7 +35,7 @@ def create_features():
     df = df.dropna()
 
     # Save the training data
-    df.to_csv('training_data.csv', index=False)
+    df.to_csv('training_data.csv')
     print(f"Done! {len(df)} matches ready for ML training.")
 
 if __name__ == "__main__":
@@ -1,8 +1,25 @@
+import os
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.metrics import accuracy_score
 import joblib # For saving the brain
 
+# 'forest' (default) or 'hgb' for histogram gradient boosting, e.g. MODEL_ENGINE=hgb
+ENGINE = os.environ.get('MODEL_ENGINE', 'forest')
+
+def make_model(engine):
+    if engine == 'forest':
+        # n_estimators=100 means we are asking 100 "scouts"
+        # min_samples_split helps prevent the bot from over-thinking (overfitting)
+        return RandomForestClassifier(n_estimators=100, min_samples_split=10, random_state=1)
+    if engine == 'hgb':
+        # Boosted trees stop early once the held-out log-loss stops improving
+        return HistGradientBoostingClassifier(
+            max_iter=300, learning_rate=0.05, min_samples_leaf=40, l2_regularization=1.0,
+            early_stopping=True, validation_fraction=0.1, n_iter_no_change=20, random_state=1
+        )
+    raise ValueError(f"Unknown model engine '{engine}' (use 'forest' or 'hgb')")
+
 def train_brain():
     # 1. Load the data from Task 6
     df = pd.read_csv('training_data.csv')
@@ -18,10 +35,8 @@ def train_brain():
     train = df.iloc[:train_size]
     test = df.iloc[train_size:]
 
-    # 4. Initialize the Random Forest
-    # n_estimators=100 means we are asking 100 "scouts"
-    # min_samples_split helps prevent the bot from over-thinking (overfitting)
-    rf = RandomForestClassifier(n_estimators=100, min_samples_split=10, random_state=1)
+    # 4. Initialize the Brain (Random Forest unless MODEL_ENGINE says otherwise)
+    rf = make_model(ENGINE)
 
     # 5. THE TRAINING (The "Learning" Phase)
     print("AI is studying 10 years of League One history...")
@@ -1,4 +1,4 @@
-import json
+from state_snapshot import load_state
 import joblib
 import pandas as pd
 import numpy as np
@@ -12,8 +12,7 @@ model = joblib.load('football_ai_model.pkl')
 
 def run_hybrid_bot():
     # 1. Load the Elo ratings
-    with open('current_elo.json', 'r') as f:
-        elo = json.load(f)
+    elo = load_state().elo
 
     print("--- 🤖 ADVANCED AI HYBRID BOT (v1.0) ---")
     balance = float(input("Bybit Balance ($): "))
@@ -1,4 +1,4 @@
-import json
+from state_snapshot import load_state
 import joblib
 import numpy as np
 
@@ -6,8 +6,7 @@ import numpy as np
 model = joblib.load('football_ai_model.pkl')
 
 def run_low_risk_bot():
-    with open('current_elo.json', 'r') as f:
-        elo = json.load(f)
+    elo = load_state().elo
 
     print("--- 🛡️ LOW-RISK SAFETY PREDICTOR (v1.1) ---")
     balance = float(input("Bybit Balance ($): "))
@@ -1,13 +1,29 @@
+import os
+import sys
+from collections import deque
+from itertools import zip_longest
 import pandas as pd
 import numpy as np
 
+WINDOW = 10          # Rolling form window (last 10 home / away games)
+CHUNK_ROWS = 5000    # Matches per chunk in --stream mode
+
+def add_targets(df):
+    df['Target_Result'] = df['FTR'].map({'H': 2, 'D': 1, 'A': 0})
+    df['Target_Over25'] = ((df['FTHG'] + df['FTAG']) > 2.5).astype(int)
+    df['Target_BTTS'] = df['BTTS_Actual']
+    df['Target_Corners10'] = ((df['HC'] + df['AC']) > 9.5).astype(int)
+    return df
+
 def create_master_features():
-    df = pd.read_csv('master_data.csv')
+    df = pd.read_csv('master_data.csv', index_col='match_id')
     df['Date'] = pd.to_datetime(df['Date'])
     
-    elo_df = pd.read_csv('elo_history.csv')
-    elo_df['Date'] = pd.to_datetime(elo_df['Date'])
-    df = pd.merge(df, elo_df, on=['Date', 'HomeTeam', 'AwayTeam'])
+    # Elo ratings share the same sorted match_id index: aligned join, one row per match
+    elo_df = pd.read_csv('elo_history.csv', index_col='match_id', usecols=['match_id', 'Home_Elo_Pre', 'Away_Elo_Pre'])
+    df = df.join(elo_df, how='inner')
+    if not df.index.is_unique:
+        raise ValueError("Duplicate match_id found. Re-run 1_standardize_data.py")
 
     # 1. GOAL DYNAMICS (Last 10 games)
     df['Home_Goals_Avg'] = df.groupby('HomeTeam')['FTHG'].transform(lambda x: x.rolling(10, closed='left').mean())
@@ -27,14 +43,89 @@ def create_master_features():
     df['Away_BTTS_Rate'] = df.groupby('AwayTeam')['BTTS_Actual'].transform(lambda x: x.rolling(10, closed='left').mean())
 
     # 5. TARGETS
-    df['Target_Result'] = df['FTR'].map({'H': 2, 'D': 1, 'A': 0})
-    df['Target_Over25'] = ((df['FTHG'] + df['FTAG']) > 2.5).astype(int)
-    df['Target_BTTS'] = df['BTTS_Actual']
-    df['Target_Corners10'] = ((df['HC'] + df['AC']) > 9.5).astype(int)
+    df = add_targets(df)
 
     df = df.dropna()
-    df.to_csv('master_training_data.csv', index=False)
+    df.to_csv('master_training_data.csv')
     print(f"✅ Master Matrix Created: {len(df)} matches with 10 features.")
 
+# --- STREAMING MODE (bounded memory, same output as above) ---
+def window_mean(window):
+    # Same rule as rolling(10, closed='left').mean(): the 10 previous games,
+    # all of them recorded, otherwise NaN. Stats are whole numbers, so the sum
+    # is exact and the mean is bit-identical to the pandas result.
+    if len(window) < WINDOW or any(v != v for v in window):
+        return np.nan
+    return sum(window) / WINDOW
+
+def stream_master_features(chunk_rows=CHUNK_ROWS):
+    # Walks master_data.csv and elo_history.csv side by side, one chunk at a time.
+    # Each team's last-10 form is carried across chunk boundaries in `form`, so
+    # only the current chunk plus a few numbers per team are ever in memory.
+    master = pd.read_csv('master_data.csv', index_col='match_id', chunksize=chunk_rows)
+    elo = pd.read_csv('elo_history.csv', index_col='match_id', usecols=['match_id', 'Home_Elo_Pre', 'Away_Elo_Pre'], chunksize=chunk_rows)
+
+    # (side, team) -> deques for [goals, corners, shots, btts]
+    form = {}
+    out_path = 'master_training_data.csv'
+    tmp_path = out_path + '.tmp'
+    total, last_id = 0, None
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)   # Left over from an interrupted run
+
+    for chunk, elo_chunk in zip_longest(master, elo):
+        if chunk is None or elo_chunk is None or not chunk.index.equals(elo_chunk.index):
+            raise ValueError("elo_history.csv is out of step with master_data.csv. Re-run 2_elo_engine.py")
+        if last_id is not None and chunk.index[0] <= last_id:
+            raise ValueError("master_data.csv is not sorted by match_id. Re-run 1_standardize_data.py")
+        last_id = chunk.index[-1]
+
+        df = chunk.join(elo_chunk)
+        df['Date'] = pd.to_datetime(df['Date'])
+        btts = ((df['FTHG'] > 0) & (df['FTAG'] > 0)).astype(int)
+
+        n = len(df)
+        home_form = np.empty((n, 4))
+        away_form = np.empty((n, 4))
+        home_vals = np.column_stack([df['FTHG'], df['HC'], df['HS'], btts]).astype(float)
+        away_vals = np.column_stack([df['FTAG'], df['AC'], df['AS'], btts]).astype(float)
+
+        for i, (home, away) in enumerate(zip(df['HomeTeam'].to_numpy(), df['AwayTeam'].to_numpy())):
+            for side, team, vals, feats in (('H', home, home_vals, home_form), ('A', away, away_vals, away_form)):
+                windows = form.get((side, team))
+                if windows is None:
+                    windows = form[(side, team)] = [deque(maxlen=WINDOW) for _ in range(4)]
+                for k in range(4):
+                    feats[i, k] = window_mean(windows[k])
+                    windows[k].append(vals[i, k])
+
+        # Same columns, in the same order, as create_master_features()
+        df['Home_Goals_Avg'] = home_form[:, 0]
+        df['Away_Goals_Avg'] = away_form[:, 0]
+        df['Home_Corners_Avg'] = home_form[:, 1]
+        df['Away_Corners_Avg'] = away_form[:, 1]
+        df['H_Shot_Eff'] = df['Home_Goals_Avg'] / pd.Series(home_form[:, 2], index=df.index).replace(0, 1)
+        df['A_Shot_Eff'] = df['Away_Goals_Avg'] / pd.Series(away_form[:, 2], index=df.index).replace(0, 1)
+        df['BTTS_Actual'] = btts
+        df['Home_BTTS_Rate'] = home_form[:, 3]
+        df['Away_BTTS_Rate'] = away_form[:, 3]
+        df = add_targets(df).dropna()
+
+        # Written straight to disk; the finished file replaces the old one in one rename
+        first = not os.path.exists(tmp_path)
+        df.to_csv(tmp_path, mode='w' if first else 'a', header=first)
+        total += len(df)
+        print(f"   ...processed up to {df['Date'].max().date() if len(df) else 'n/a'} ({total} rows written)")
+
+    if not os.path.exists(tmp_path):
+        print("❌ master_data.csv is empty. Run 1_standardize_data.py first.")
+        return
+    os.replace(tmp_path, out_path)
+    print(f"✅ Master Matrix Created (streamed): {total} matches with 10 features.")
+
 if __name__ == "__main__":
-    create_master_features()
\ No newline at end of file
+    # python 8_pro_preprocessor.py [--stream]
+    if '--stream' in sys.argv:
+        stream_master_features()
+    else:
+        create_master_features()
\ No newline at end of file
@@ -1,31 +1,180 @@
+import os
+import sys
+import json
+import shutil
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 import joblib
 
-def train_master_brains():
+# THE 10 FEATURE LIST
+FEATURES = [
+    'Home_Elo_Pre', 'Away_Elo_Pre', 
+    'Home_Goals_Avg', 'Away_Goals_Avg',
+    'Home_Corners_Avg', 'Away_Corners_Avg',
+    'H_Shot_Eff', 'A_Shot_Eff',
+    'Home_BTTS_Rate', 'Away_BTTS_Rate'
+]
+
+TARGETS = {
+    'result': 'Target_Result',
+    'goals': 'Target_Over25',
+    'btts': 'Target_BTTS',
+    'corners': 'Target_Corners10'
+}
+
+# MODEL ENGINE PER BRAIN
+# 'forest' = the original 200-tree RandomForest
+# 'hgb'    = histogram gradient boosting (faster to train, much smaller pickle)
+# Override from the shell, e.g. MODEL_ENGINE="goals=hgb,btts=hgb" or MODEL_ENGINE=hgb for all
+ENGINES = {'result': 'forest', 'goals': 'forest', 'btts': 'forest', 'corners': 'forest'}
+
+def make_model(engine):
+    if engine == 'forest':
+        return RandomForestClassifier(n_estimators=200, min_samples_split=10, random_state=1)
+    if engine == 'hgb':
+        # Early stopping holds out 10% of the rows and stops adding trees
+        # once the validation log-loss stops improving for 20 rounds
+        return HistGradientBoostingClassifier(
+            max_iter=500, learning_rate=0.05, max_leaf_nodes=31, min_samples_leaf=40,
+            l2_regularization=1.0, early_stopping=True, validation_fraction=0.1,
+            n_iter_no_change=20, random_state=1
+        )
+    raise ValueError(f"Unknown model engine '{engine}' (use 'forest' or 'hgb')")
+
+def get_engines():
+    engines = dict(ENGINES)
+    override = os.environ.get('MODEL_ENGINE', '').strip()
+    for part in filter(None, override.split(',')):
+        if '=' in part:
+            name, engine = part.split('=', 1)
+            engines[name.strip()] = engine.strip()
+        else:
+            engines = {name: part.strip() for name in engines}
+    return engines
+
+# INCREMENTAL (SLIDING-WINDOW) RETRAINING
+# Each weekly run keeps the forest, fits NEW_TREES extra trees on the latest
+# RECENT_WINDOW matches and retires the oldest trees beyond FOREST_SIZE.
+NEW_TREES = 20
+RECENT_WINDOW = 1500
+FOREST_SIZE = 200
+
+# Every training run is saved as model_versions/v<N>/ so we can roll back.
+# The folder is git-ignored (a forest pickle per brain per week would bloat the
+# history); the weekly workflow keeps it in the Actions cache instead. A fresh
+# checkout without it has no manifest, so --incremental falls back to a full rebuild.
+MODEL_DIR = 'model_versions'
+MANIFEST = os.path.join(MODEL_DIR, 'manifest.json')
+KEEP_VERSIONS = 5
+
+def grow_forest(model, recent, target, seed):
+    # Returns False when the window cannot extend this forest (caller rebuilds)
+    if not hasattr(model, 'estimators_') or sorted(recent[target].unique()) != list(model.classes_):
+        return False
+    # A fresh seed per run: with a fixed random_state every run would draw the
+    # same tree seeds (and bootstrap rows) and the forest would fill with copies
+    model.random_state = seed
+    model.warm_start = True
+    model.n_estimators = len(model.estimators_) + NEW_TREES
+    model.fit(recent[FEATURES], recent[target])
+    model.warm_start = False
+
+    # Sliding window: the oldest trees sit at the front of estimators_
+    excess = len(model.estimators_) - FOREST_SIZE
+    if excess > 0:
+        model.estimators_ = model.estimators_[excess:]
+        model.n_estimators = len(model.estimators_)
+    return True
+
+def load_manifest():
+    if not os.path.exists(MANIFEST):
+        return {'current': None, 'versions': []}
+    with open(MANIFEST, 'r') as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    tmp = MANIFEST + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, MANIFEST)
+
+def publish(version):
+    # The app and value finders always load model_<name>.pkl from the root
+    for name in TARGETS:
+        shutil.copyfile(os.path.join(MODEL_DIR, f"v{version}", f"model_{name}.pkl"), f"model_{name}.pkl")
+
+def train_master_brains(mode='full'):
+    # mode: 'full' = rebuild from scratch, 'incremental' = grow the current forests
     df = pd.read_csv('master_training_data.csv')
-    
-    # THE 10 FEATURE LIST
-    features = [
-        'Home_Elo_Pre', 'Away_Elo_Pre', 
-        'Home_Goals_Avg', 'Away_Goals_Avg',
-        'Home_Corners_Avg', 'Away_Corners_Avg',
-        'H_Shot_Eff', 'A_Shot_Eff',
-        'Home_BTTS_Rate', 'Away_BTTS_Rate'
-    ]
-    
-    targets = {
-        'result': 'Target_Result',
-        'goals': 'Target_Over25',
-        'btts': 'Target_BTTS',
-        'corners': 'Target_Corners10'
-    }
-
-    for name, target in targets.items():
-        model = RandomForestClassifier(n_estimators=200, min_samples_split=10, random_state=1)
-        model.fit(df[features], df[target])
-        joblib.dump(model, f'model_{name}.pkl')
-        print(f"Brain Trained: {name}")
+    engines = get_engines()
+    manifest = load_manifest()
+    current = next((v for v in manifest['versions'] if v['version'] == manifest['current']), None)
+
+    if mode == 'incremental':
+        if current is None:
+            print("⚠️ No saved version yet. Running a full rebuild.")
+            mode = 'full'
+        elif current['features'] != FEATURES or current['engines'] != engines:
+            print("⚠️ Feature schema or engines changed. Running a full rebuild.")
+            mode = 'full'
+        elif current['rows'] >= len(df):
+            print("✅ No new matches since the last version. Nothing to retrain.")
+            return
+
+    version = max([v['version'] for v in manifest['versions']], default=0) + 1
+    out_dir = os.path.join(MODEL_DIR, f"v{version}")
+    os.makedirs(out_dir, exist_ok=True)
+    recent = df.iloc[-RECENT_WINDOW:]
+    modes = {}
+
+    for name, target in TARGETS.items():
+        model = None
+        if mode == 'incremental' and engines[name] == 'forest':
+            model = joblib.load(os.path.join(MODEL_DIR, f"v{current['version']}", f"model_{name}.pkl"))
+            if grow_forest(model, recent, target, seed=version):
+                modes[name] = 'incremental'
+            else:
+                model = None
+        if model is None:
+            model = make_model(engines[name])
+            model.fit(df[FEATURES], df[target])
+            modes[name] = 'full'
+        joblib.dump(model, os.path.join(out_dir, f"model_{name}.pkl"))
+        print(f"Brain Trained: {name} ({engines[name]}, {modes[name]})")
+
+    manifest['versions'].append({
+        'version': version,
+        'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'modes': modes,
+        'rows': len(df),
+        'features': FEATURES,
+        'engines': engines,
+    })
+    manifest['current'] = version
+
+    # Keep the last few versions for rollback
+    for old in manifest['versions'][:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(MODEL_DIR, f"v{old['version']}"), ignore_errors=True)
+    manifest['versions'] = manifest['versions'][-KEEP_VERSIONS:]
+
+    publish(version)
+    save_manifest(manifest)
+    print(f"📦 Model version v{version} is live.")
+
+def rollback():
+    manifest = load_manifest()
+    older = [v['version'] for v in manifest['versions'] if manifest['current'] and v['version'] < manifest['current']]
+    if not older:
+        print("❌ No previous model version to roll back to.")
+        return
+    publish(older[-1])
+    manifest['current'] = older[-1]
+    save_manifest(manifest)
+    print(f"⏪ Rolled back to model version v{older[-1]}.")
 
 if __name__ == "__main__":
-    train_master_brains()
\ No newline at end of file
+    # python 9_train_pro_models.py [--incremental | --full | --rollback]
+    if '--rollback' in sys.argv:
+        rollback()
+    else:
+        train_master_brains('incremental' if '--incremental' in sys.argv else 'full')
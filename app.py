@@ -1,10 +1,10 @@
 import streamlit as st
 import pandas as pd
-import json
-import joblib
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from tree_bands import fixture_bands, discounted_kelly
+import match_features
 
 # --- ELITE UI CONFIG ---
 st.set_page_config(page_title="QUANT-X TERMINAL", layout="wide")
@@ -21,15 +21,7 @@ st.markdown("""
 @st.cache_resource
 def load_assets():
     try:
-        models = ['result', 'goals', 'btts', 'corners']
-        brains = {m: joblib.load(f'model_{m}.pkl') for m in models}
-        with open('current_elo.json', 'r') as f:
-            elo = json.load(f)
-        with open('team_stats_snapshot.json', 'r') as f:
-            stats = json.load(f)
-        with open('upcoming_matches.json', 'r') as f:
-            fixtures = json.load(f)
-        return brains, elo, stats, fixtures
+        return match_features.load_assets()
     except Exception as e:
         st.error(f"Critical System Error: {e}")
         return None, None, None, None
@@ -39,9 +31,20 @@ brains, elo_ratings, team_stats, upcoming_matches = load_assets()
 # --- HELPER: Professional Naming Safety ---
 def get_safe_stats(name):
     # If team exists, return stats. If not (like Cardiff), return League Averages
-    if name in team_stats:
-        return team_stats[name]
-    return {'goals': 1.3, 'corners': 4.8, 'eff': 0.10, 'btts': 0.52}
+    return match_features.get_safe_stats(team_stats, name)
+
+def build_features(h_team, a_team):
+    return match_features.build_features(h_team, a_team, elo_ratings, team_stats)
+
+# --- UNCERTAINTY BANDS (one batched tree pass over the whole schedule) ---
+@st.cache_resource
+def load_bands():
+    keys = [(m['home'], m['away']) for m in upcoming_matches or []]
+    if not keys:
+        return {}
+    bands = fixture_bands(brains, np.array([build_features(h, a) for h, a in keys]))
+    return {key: {name: {stat: v[i] for stat, v in b.items()} for name, b in bands.items()}
+            for i, key in enumerate(keys)}
 
 # --- MAIN UI ---
 st.title("🛡️ QUANT-X PRO TERMINAL")
@@ -66,18 +69,18 @@ if 'selected_match' in st.session_state:
     h_snap = get_safe_stats(h_team)
     a_snap = get_safe_stats(a_team)
 
-    # Prepare Data
-    feats = np.array([[
-        elo_ratings.get(h_team, 1500), elo_ratings.get(a_team, 1500),
-        h_snap['goals'], a_snap['goals'], h_snap['corners'], a_snap['corners'],
-        h_snap['eff'], a_snap['eff'], h_snap['btts'], a_snap['btts']
-    ]])
+    # Inference (mean of the trees == predict_proba, plus the spread around it)
+    band = load_bands().get((h_team, a_team))
+    if band is None:
+        band = {name: {stat: v[0] for stat, v in b.items()}
+                for name, b in fixture_bands(brains, np.array([build_features(h_team, a_team)])).items()}
+    p_res = band['result']['mean'] # [A, D, H]
+    p_goals = band['goals']['mean'][1]
+    p_btts = band['btts']['mean'][1]
+    p_corn = band['corners']['mean'][1]
 
-    # Inference
-    p_res = brains['result'].predict_proba(feats)[0] # [A, D, H]
-    p_goals = brains['goals'].predict_proba(feats)[0][1]
-    p_btts = brains['btts'].predict_proba(feats)[0][1]
-    p_corn = brains['corners'].predict_proba(feats)[0][1]
+    def band_text(name, col):
+        return f"80% of trees: {band[name]['p10'][col]:.1%} – {band[name]['p90'][col]:.1%}"
 
     st.divider()
     st.header(f"🔍 Analysis Report: {h_team} vs {a_team}")
@@ -88,6 +91,10 @@ if 'selected_match' in st.session_state:
     t2.metric("⚖️ DRAW", f"{p_res[1]:.1%}")
     t3.metric(f"🚀 {a_team}", f"{p_res[0]:.1%}")
     t4.metric("⚽ BTTS", f"{p_btts:.1%}")
+    t1.caption(band_text('result', 2))
+    t2.caption(band_text('result', 1))
+    t3.caption(band_text('result', 0))
+    t4.caption(band_text('btts', 1))
 
     # THE TWO GRAPHS (PIE AND BAR)
     st.divider()
@@ -107,9 +114,14 @@ if 'selected_match' in st.session_state:
         st.write("### 📊 Market Volatility (Momentum)")
         m_labels = ['Goals (>2.5)', 'Corners (>9.5)', 'BTTS (Yes)']
         m_values = [p_goals, p_corn, p_btts]
+        m_low = [band[n]['p10'][1] for n in ['goals', 'corners', 'btts']]
+        m_high = [band[n]['p90'][1] for n in ['goals', 'corners', 'btts']]
         fig_bar = go.Figure(data=[go.Bar(
             x=m_labels, y=m_values, 
             marker_color='#00ffcc',
+            error_y=dict(type='data', symmetric=False,
+                         array=[h - v for h, v in zip(m_high, m_values)],
+                         arrayminus=[v - l for l, v in zip(m_low, m_values)]),
             text=[f"{v:.1%}" for v in m_values],
             textposition='auto'
         )])
@@ -129,9 +141,13 @@ if 'selected_match' in st.session_state:
         st.write(f"{a_team}: {a_snap['goals']:.2f}")
     with m3:
         odds = st.number_input("Bookie Odds", value=2.0)
+        pick = int(np.argmax(p_res))
         edge = (max(p_res) * odds) - 1
         if edge > 0:
             st.success(f"VALUE: {edge:.1%}")
-            st.write(f"Stake: {max(0.20, (( (odds-1)*max(p_res) - (1-max(p_res)) )/(odds-1)/8)*balance):.2f}")
+            # 1/8 Kelly, shrunk when the forest disagrees about the pick
+            frac = float(discounted_kelly(p_res[pick], band['result']['std'][pick], odds))
+            st.write(f"Stake: {max(0.20, frac*balance):.2f}")
+            st.caption(f"{band_text('result', pick)} | Full 1/8 Kelly: {max(0.20, (( (odds-1)*max(p_res) - (1-max(p_res)) )/(odds-1)/8)*balance):.2f}")
         else:
             st.error("No Value Detected")
\ No newline at end of file
@@ -24,7 +24,7 @@ def run_auto_update():
         os.system("python3 1_standardize_data.py")
         os.system("python3 2_elo_engine.py")
         os.system("python3 8_pro_preprocessor.py")
-        os.system("python3 9_train_pro_models.py")
+        os.system("python3 9_train_pro_models.py --incremental")
         os.system("python3 11_create_snapshot.py")
         print("🚀 ALL SYSTEMS UPDATED AND AI RETRAINED.")
         
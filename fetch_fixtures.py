@@ -1,5 +1,5 @@
 import pandas as pd
-import json
+from state_snapshot import update_state
 
 def generate_fixtures():
     print("search 🕵️ Fetching fixtures from public data...")
@@ -20,12 +20,12 @@ def generate_fixtures():
                 "away": row['Away Team']
             })
             
-        with open('upcoming_matches.json', 'w') as f:
-            json.dump(matches, f)
+        update_state(fixtures=matches)
         print(f"✅ Created upcoming_matches.json with {len(matches)} games.")
         
     except:
-        print("⚠️ Direct fetch failed. Please update upcoming_matches.json manually using the template.")
+        print("⚠️ Direct fetch failed. Please update upcoming_matches.json manually using the template,")
+        print("   then run: python state_snapshot.py")
 
 if __name__ == "__main__":
     generate_fixtures()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import joblib
+import numpy as np
+from state_snapshot import load_state
+
+# The four brains trained by 9_train_pro_models.py
+MODELS = ['result', 'goals', 'btts', 'corners']
+
+# League averages for teams missing from the snapshot (like Cardiff)
+DEFAULT_STATS = {'goals': 1.3, 'corners': 4.8, 'eff': 0.10, 'btts': 0.52}
+
+
+def load_assets():
+    brains = {m: joblib.load(f'model_{m}.pkl') for m in MODELS}
+    # One consistent, memory-mapped snapshot instead of three JSON files
+    state = load_state()
+    return brains, state.elo, state.stats, state.fixtures
+
+
+def get_safe_stats(stats, name):
+    # If team exists, return stats. If not, return League Averages
+    if name in stats:
+        return stats[name]
+    return DEFAULT_STATS
+
+
+def build_features(home, away, elo, stats):
+    # THE 10 FEATURES, in the order the brains were trained on
+    h = get_safe_stats(stats, home)
+    a = get_safe_stats(stats, away)
+    return [
+        float(elo.get(home, 1500)), float(elo.get(away, 1500)),
+        float(h['goals']), float(a['goals']), float(h['corners']), float(a['corners']),
+        float(h['eff']), float(a['eff']), float(h['btts']), float(a['btts'])
+    ]
+
+
+def build_matrix(pairs, elo, stats):
+    # One row per (home, away) pair, ready for predict_proba
+    return np.array([build_features(home, away, elo, stats) for home, away in pairs], dtype=float)
@@ -0,0 +1,228 @@
+import os
+import json
+import mmap
+import struct
+import tempfile
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+
+# One binary file holds everything the app and value finders need at runtime:
+# team index + Elo + form columns + the upcoming fixture list.
+#
+# Layout: b'QXSTATE\0' | uint32 format | uint32 header length | JSON header
+#         | column buffers, each 64-byte aligned, offsets relative to data start
+STATE_FILE = 'runtime_state.bin'
+MAGIC = b'QXSTATE\0'
+FORMAT_VERSION = 1
+ALIGN = 64
+
+# The loose JSON files are still exported for older readers
+ELO_JSON = 'current_elo.json'
+STATS_JSON = 'team_stats_snapshot.json'
+FIXTURES_JSON = 'upcoming_matches.json'
+
+STAT_FIELDS = ['goals', 'corners', 'eff', 'btts']
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+class _EloView(Mapping):
+    # Reads like the old current_elo.json dict: elo.get(team, 1500), team in elo
+    def __init__(self, state):
+        self._s = state
+
+    def __getitem__(self, team):
+        i = self._s.team_index.get(team)
+        if i is None or not self._s.columns['has_elo'][i]:
+            raise KeyError(team)
+        return float(self._s.columns['elo'][i])
+
+    def __iter__(self):
+        has = self._s.columns['has_elo']
+        return (t for i, t in enumerate(self._s.teams) if has[i])
+
+    def __len__(self):
+        return int(self._s.columns['has_elo'].sum())
+
+
+class _StatsView(Mapping):
+    # Reads like the old team_stats_snapshot.json dict: stats[team]['goals']
+    def __init__(self, state):
+        self._s = state
+
+    def __getitem__(self, team):
+        i = self._s.team_index.get(team)
+        if i is None or not self._s.columns['has_stats'][i]:
+            raise KeyError(team)
+        return {k: float(self._s.columns[k][i]) for k in STAT_FIELDS}
+
+    def __iter__(self):
+        has = self._s.columns['has_stats']
+        return (t for i, t in enumerate(self._s.teams) if has[i])
+
+    def __len__(self):
+        return int(self._s.columns['has_stats'].sum())
+
+
+class RuntimeState:
+    def __init__(self, version, created, teams, columns, buffer=None):
+        self.version = version
+        self.created = created
+        self.teams = teams
+        self.team_index = {t: i for i, t in enumerate(teams)}
+        self.columns = columns
+        self._buffer = buffer   # Keeps the mmap alive while columns point into it
+        self.elo = _EloView(self)
+        self.stats = _StatsView(self)
+
+    @property
+    def fixtures(self):
+        cols = self.columns
+        out = []
+        for h, a, fid, ts in zip(cols['fixture_home'], cols['fixture_away'], cols['fixture_id'], cols['fixture_timestamp']):
+            match = {}
+            if fid >= 0:
+                match['id'] = int(fid)
+            if ts >= 0:
+                match['timestamp'] = int(ts)
+            match['home'] = self.teams[h]
+            match['away'] = self.teams[a]
+            out.append(match)
+        return out
+
+
+def _build_columns(elo, stats, fixtures):
+    teams = sorted(set(elo) | set(stats) | {m['home'] for m in fixtures} | {m['away'] for m in fixtures})
+    index = {t: i for i, t in enumerate(teams)}
+    cols = {
+        'has_elo': np.array([t in elo for t in teams], dtype='u1'),
+        'elo': np.array([elo.get(t, np.nan) for t in teams], dtype='<f8'),
+        'has_stats': np.array([t in stats for t in teams], dtype='u1'),
+    }
+    for k in STAT_FIELDS:
+        cols[k] = np.array([stats[t][k] if t in stats else np.nan for t in teams], dtype='<f8')
+    cols['fixture_home'] = np.array([index[m['home']] for m in fixtures], dtype='<i4')
+    cols['fixture_away'] = np.array([index[m['away']] for m in fixtures], dtype='<i4')
+    cols['fixture_id'] = np.array([m.get('id', -1) for m in fixtures], dtype='<i8')
+    cols['fixture_timestamp'] = np.array([m.get('timestamp', -1) for m in fixtures], dtype='<i8')
+    return teams, cols
+
+
+def _atomic_write(path, write):
+    # Write next to the target, fsync, then rename over it: readers see the
+    # old file or the new file, never half of one
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path), dir=folder)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)   # mkstemp files are owner-only
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _read_version(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        head = f.read(16)
+        if len(head) < 16 or head[:8] != MAGIC:
+            return 0
+        hlen = struct.unpack_from('<I', head, 12)[0]
+        return json.loads(f.read(hlen))['version']
+
+
+def write_state(elo, stats, fixtures, path=STATE_FILE):
+    teams, cols = _build_columns(elo, stats, fixtures)
+    layout, offset = {}, 0
+    for name, arr in cols.items():
+        layout[name] = [arr.dtype.str, offset, len(arr)]
+        offset = _align(offset + arr.nbytes)
+
+    version = _read_version(path) + 1
+    header = json.dumps({
+        'version': version,
+        'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'teams': teams,
+        'columns': layout,
+    }).encode()
+    data_start = _align(16 + len(header))
+
+    def write(f):
+        f.write(MAGIC + struct.pack('<II', FORMAT_VERSION, len(header)) + header)
+        f.write(b'\0' * (data_start - 16 - len(header)))
+        pos = 0
+        for name, arr in cols.items():
+            f.write(b'\0' * (layout[name][1] - pos))
+            f.write(arr.tobytes())
+            pos = layout[name][1] + arr.nbytes
+        # Pad the tail so even an empty last column points inside the file
+        f.write(b'\0' * (offset - pos))
+
+    _atomic_write(path, write)
+    return version
+
+
+def _load_legacy():
+    # No binary snapshot yet: build one in memory from the loose JSON files
+    def read(path, default):
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r') as f:
+            return json.load(f)
+    teams, cols = _build_columns(read(ELO_JSON, {}), read(STATS_JSON, {}), read(FIXTURES_JSON, []))
+    return RuntimeState(0, None, teams, cols)
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return _load_legacy()
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:8] != MAGIC:
+        raise ValueError(f"{path} is not a runtime state snapshot")
+    fmt, hlen = struct.unpack_from('<II', mm, 8)
+    if fmt != FORMAT_VERSION:
+        raise ValueError(f"{path} uses snapshot format {fmt}, expected {FORMAT_VERSION}")
+    header = json.loads(mm[16:16 + hlen])
+    base = _align(16 + hlen)
+
+    # Zero-copy: every column is a read-only numpy view straight into the mapped file
+    columns = {name: np.frombuffer(mm, dtype=np.dtype(dt), count=n, offset=base + off)
+               for name, (dt, off, n) in header['columns'].items()}
+    return RuntimeState(header['version'], header['created'], header['teams'], columns, mm)
+
+
+def export_json(state):
+    # Old readers (and anything pinned to the JSON files) keep working
+    for path, data in ((ELO_JSON, dict(state.elo)), (STATS_JSON, dict(state.stats)), (FIXTURES_JSON, state.fixtures)):
+        payload = json.dumps(data).encode()
+        _atomic_write(path, lambda f: f.write(payload))
+
+
+def update_state(elo=None, stats=None, fixtures=None, path=STATE_FILE):
+    # Each pipeline script replaces only its own part; the rest is carried over
+    current = load_state(path)
+    elo = {t: float(v) for t, v in (elo if elo is not None else current.elo).items()}
+    stats = {t: {k: float(s[k]) for k in STAT_FIELDS} for t, s in (stats if stats is not None else current.stats).items()}
+    fixtures = fixtures if fixtures is not None else current.fixtures
+    version = write_state(elo, stats, fixtures, path)
+    export_json(load_state(path))
+    print(f"💾 Runtime state v{version} saved: {len(elo)} ratings, {len(stats)} form rows, {len(fixtures)} fixtures.")
+    return version
+
+
+if __name__ == "__main__":
+    # python state_snapshot.py -> (re)build runtime_state.bin from the current JSON files
+    # (e.g. after editing upcoming_matches.json by hand). Always read the JSON here:
+    # load_state() would return the existing binary and export it over the edits.
+    state = _load_legacy()
+    update_state(dict(state.elo), dict(state.stats), state.fixtures)
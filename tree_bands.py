@@ -0,0 +1,66 @@
+import weakref
+import numpy as np
+
+# Percentile bands reported for every fixture/market
+BANDS = (10, 50, 90)
+
+# Per-model table of normalised leaf probabilities, built once per loaded brain
+_LEAF_TABLES = weakref.WeakKeyDictionary()
+
+
+def _leaf_table(model):
+    # Shape (n_trees, max_nodes, n_classes). Built once when a brain is first
+    # used; every prediction after that is a single gather into this array.
+    table = _LEAF_TABLES.get(model)
+    if table is None:
+        trees = [est.tree_ for est in model.estimators_]
+        max_nodes = max(t.node_count for t in trees)
+        table = np.zeros((len(trees), max_nodes, model.n_classes_))
+        for i, t in enumerate(trees):
+            counts = t.value[:, 0, :]
+            table[i, :t.node_count] = counts / counts.sum(axis=1, keepdims=True)
+        _LEAF_TABLES[model] = table
+    return table
+
+
+def tree_probas(model, X):
+    # Per-tree probabilities, shape (n_fixtures, n_trees, n_classes).
+    # forest.apply walks all trees for all rows in one call, then the leaf
+    # ids index straight into the leaf table. The mean over axis 1 equals
+    # model.predict_proba(X).
+    X = np.asarray(X, dtype=np.float32)
+    if not hasattr(model, 'estimators_') or not hasattr(model, 'apply'):
+        # Boosted brains (MODEL_ENGINE=hgb) have no tree vote: zero-width band
+        return model.predict_proba(X)[:, None, :]
+    leaves = model.apply(X)
+    table = _leaf_table(model)
+    return table[np.arange(table.shape[0]), leaves]
+
+
+def proba_bands(model, X, percentiles=BANDS):
+    # Returns {'mean', 'std', 'p10', 'p50', 'p90'}, each shaped (n_fixtures, n_classes)
+    trees = tree_probas(model, X)
+    out = {'mean': trees.mean(axis=1), 'std': trees.std(axis=1)}
+    for q, band in zip(percentiles, np.percentile(trees, percentiles, axis=1)):
+        out[f'p{q}'] = band
+    return out
+
+
+def discounted_kelly(prob, std, odds, divisor=8):
+    # Kelly fraction shrunk by how much the trees disagree about the edge.
+    # edge = p*odds - 1 has spread std*odds across the forest, and the stake is
+    # scaled by edge^2 / (edge^2 + spread^2): a unanimous forest keeps the full
+    # (1/divisor) Kelly stake, a split forest bets close to nothing.
+    prob, std, odds = np.asarray(prob, float), np.asarray(std, float), np.asarray(odds, float)
+    b = np.maximum(odds - 1, 1e-9)
+    edge = prob * odds - 1
+    spread = std * odds
+    shrink = np.where(edge > 0, edge ** 2 / np.maximum(edge ** 2 + spread ** 2, 1e-12), 0.0)
+    kelly = np.maximum(edge / b, 0.0)
+    return kelly * shrink / divisor
+
+
+def fixture_bands(brains, X):
+    # One batched pass per brain over every fixture. Result columns follow
+    # app.py: result -> [Away, Draw, Home], binary markets -> [No, Yes]
+    return {name: proba_bands(brain, X) for name, brain in brains.items()}